@@ -14,6 +14,8 @@ from dotenv import load_dotenv
 import os
 import time
 
+from session_store import SessionStore
+
 class AIClientError(Exception):
     """
     Custom exception for AI client errors (e.g., unresponsive service).
@@ -27,6 +29,7 @@ class AIClient:
         model_name: str = "command-r-plus-08-2024",
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        session_store: SessionStore = None,
     ):
         """
         Initializes the AIClient with Cohere's Chat API.
@@ -36,6 +39,7 @@ class AIClient:
             model_name (str): Cohere model name, e.g. "command-r-plus-08-2024".
             max_retries (int): Number of times to retry if failure.
             retry_delay (float): Time (seconds) to wait between retries.
+            session_store (SessionStore): Holds multi-turn history; a default store is created if omitted.
         """
         # Retrieve API key from argument or environment
         load_dotenv()
@@ -46,16 +50,28 @@ class AIClient:
         self.model_name = model_name
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.session_store = session_store if session_store is not None else SessionStore()
 
         # Create a Cohere client (ClientV2 for the chat endpoint)
         self.client = cohere.ClientV2(api_key=self.api_key)
 
-    def get_ai_response(self, prompt: str) -> str:
+    def get_ai_response(self, prompt: str, session_id: str = None, query_category=None,
+                        instructions: str = None) -> str:
         """
         Retrieves a response from Cohere's Chat API using the provided prompt.
 
+        When a session_id is given, earlier turns of that session are sent
+        along with the prompt (trimmed to the category's token budget) and
+        the new exchange is recorded for follow-up questions. For sessions,
+        pass the raw user query as prompt and the template (see
+        PromptSelector.select_template) as instructions, so only the query
+        is stored in history.
+
         Args:
             prompt (str): The user's query or system instructions.
+            session_id (str): Optional conversation identifier for multi-turn context.
+            query_category (QueryCategory): Category used to pick the history token budget.
+            instructions (str): Optional system instructions, sent as a system message.
 
         Returns:
             str: The Cohere model's response text.
@@ -66,19 +82,25 @@ class AIClient:
         if not prompt.strip():
             raise AIClientError("Prompt cannot be empty.")
 
+        # We construct messages for the Chat API
+        # Without a session, the entire prompt is treated as a single user message.
+        if session_id is None:
+            messages = [
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ]
+            if instructions:
+                messages.insert(0, {"role": "system", "content": instructions})
+        else:
+            messages = self.session_store.build_messages(session_id, prompt, query_category, instructions)
+
         # Attempt to call Cohere multiple times (up to max_retries) to handle transient issues
         last_err = None
+        text = None
         for attempt in range(1, self.max_retries + 1):
             try:
-                # We construct messages for the Chat API
-                # The entire prompt is treated as a single user message in this simple example.
-                messages = [
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ]
-
                 # Call Cohere's Chat endpoint
                 # (can use chat_stream to get response in real time, without wait)
                 response = self.client.chat(
@@ -94,10 +116,11 @@ class AIClient:
                 # For Command-R style responses, we expect `response.message.content` to be a list of tokens/segments.
                 content = response.message.content
                 if isinstance(content, list):
-                    return "".join(segment.text for segment in content)
+                    text = "".join(segment.text for segment in content)
                 else:
-                    # If it's a string, just return it directly
-                    return content
+                    # If it's a string, just use it directly
+                    text = content
+                break
 
             except Exception as e:
                 last_err = e
@@ -108,5 +131,11 @@ class AIClient:
                     raise AIClientError(f"Cohere Chat API failed after {self.max_retries} attempts."
                                        f"Last error: {last_err}") from last_err
 
-        # Error handling (unlikely to reach here though).
-        raise AIClientError("Unknown error occurred in Cohere AI client.")
+        if text is None:
+            # Error handling (unlikely to reach here though).
+            raise AIClientError("Unknown error occurred in Cohere AI client.")
+
+        # Recorded outside the retry loop so a bookkeeping failure never triggers another API call.
+        if session_id is not None:
+            self.session_store.record_turn(session_id, prompt, text)
+        return text
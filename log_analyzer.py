@@ -0,0 +1,445 @@
+"""
+log_analyzer.py
+
+Streams through the application.log written by AppLogger and
+summarizes it in a single pass with constant memory, so large
+logs can be inspected during an incident without grepping.
+
+Includes:
+- parse_line which understands both the plain-text format
+                ("[timestamp] LEVEL: type - message") and JSON lines.
+- LogStats class which accumulates error-type counts, error rates
+                per time window, and the most frequent error messages.
+- read_records / follow which read the file in large buffered
+                chunks, optionally tailing it as new lines are appended.
+
+Usage:
+    python log_analyzer.py [log_file] [--follow] [--window SECONDS] [--max-windows N] [--top N]
+"""
+
+from collections import Counter, namedtuple
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+CHUNK_SIZE = 1 << 20  # 1 MiB reads keep syscalls rare on multi-GB files
+MAX_LINE_LENGTH = 1 << 20  # longer lines are skipped so memory stays bounded
+
+LogRecord = namedtuple("LogRecord", ["timestamp", "level", "type", "message"])
+
+# Matches AppLogger's text format: "[2025-01-01 12:00:00] ERROR: SomeType - details"
+_TEXT_LINE = re.compile(rb"^\[([^\]]+)\] ([A-Z]+): (.*?) - (.*)$")
+
+
+def parse_line(line: bytes):
+    """
+    Parses a single log line in either the text or JSON format.
+
+    Args:
+        line (bytes): One raw line from the log file, without the trailing newline.
+
+    Returns:
+        LogRecord | None: The parsed record, or None if the line is not a log entry
+            (e.g., a continuation line of a multi-line message).
+    """
+    line = line.rstrip(b"\r")
+    if line.startswith(b"{"):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return LogRecord(
+            str(data.get("timestamp", "")),
+            str(data.get("level", "")).upper(),
+            str(data.get("type", "")),
+            str(data.get("message", "")),
+        )
+
+    match = _TEXT_LINE.match(line)
+    if match is None:
+        return None
+    timestamp, level, error_type, message = match.groups()
+    return LogRecord(
+        timestamp.decode("ascii", "replace"),
+        level.decode("ascii", "replace"),
+        error_type.decode("utf-8", "replace"),
+        message.decode("utf-8", "replace"),
+    )
+
+
+class LogStats:
+    def __init__(self, window_seconds: int = 60, max_windows: int = 60, top_n: int = 10, capacity: int = 1000):
+        """
+        Initializes empty statistics.
+
+        Args:
+            window_seconds (int): Width of each time window used for error rates.
+            max_windows (int): Number of most recent windows to keep.
+            top_n (int): Number of top messages to report.
+            capacity (int): Number of distinct messages tracked for the top list.
+                Counts are exact while fewer distinct messages have been seen and
+                approximate (Space-Saving) beyond that, keeping memory constant.
+        """
+        if window_seconds < 1:
+            raise ValueError("window_seconds must be at least 1.")
+
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self.top_n = top_n
+        self.capacity = max(capacity, top_n)
+
+        self.total_lines = 0
+        self.unparsed_lines = 0
+        self.level_counts = Counter()
+        self.error_type_counts = Counter()
+        self.window_counts = {}
+        self.dropped_windows = 0
+        self.unparsed_timestamps = 0
+        self.dropped_window_errors = 0
+        self.message_counts = {}
+
+        # Space-Saving stream summary: messages grouped by count, so the least
+        # frequent entry is found in O(1) instead of scanning every counter.
+        self._count_buckets = {}
+        self._min_count = 0
+
+        # Consecutive lines usually share a timestamp, so cache the last conversion.
+        self._last_timestamp = None
+        self._last_window = None
+
+    def add_line(self, line: bytes):
+        """
+        Parses a raw log line and folds it into the statistics.
+
+        Args:
+            line (bytes): One raw line from the log file.
+        """
+        self.total_lines += 1
+        record = parse_line(line)
+        if record is None:
+            self.unparsed_lines += 1
+            return
+        self.add_record(record)
+
+    def add_skipped_line(self):
+        """
+        Counts a line that was too long to parse and was skipped unread.
+        """
+        self.total_lines += 1
+        self.unparsed_lines += 1
+
+    def add_record(self, record: LogRecord):
+        """
+        Folds an already-parsed record into the statistics.
+
+        Args:
+            record (LogRecord): The parsed log entry.
+        """
+        self.level_counts[record.level] += 1
+        if record.level != "ERROR":
+            return
+
+        self.error_type_counts[record.type] += 1
+        self._count_message(f"{record.type} - {record.message}")
+
+        window = self._window_for(record.timestamp)
+        if window is None:
+            self.unparsed_timestamps += 1
+            return
+        if window in self.window_counts:
+            self.window_counts[window] += 1
+            return
+
+        # Lines can arrive out of order (several writers, window boundaries), so
+        # drop windows older than everything kept and evict by time, not arrival.
+        if len(self.window_counts) >= self.max_windows:
+            oldest = min(self.window_counts)
+            if window < oldest:
+                self.dropped_window_errors += 1
+                return
+            self.dropped_windows += 1
+            self.dropped_window_errors += self.window_counts.pop(oldest)
+        self.window_counts[window] = 1
+
+    def top_messages(self):
+        """
+        Returns the most frequent error messages.
+
+        Returns:
+            list: (message, count) tuples, most frequent first.
+        """
+        ranked = sorted(self.message_counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked[: self.top_n]
+
+    def report(self) -> str:
+        """
+        Formats the statistics as a human-readable summary.
+
+        Returns:
+            str: The multi-line report.
+        """
+        lines = [
+            f"Lines read: {self.total_lines} (unparsed: {self.unparsed_lines})",
+            "Levels: " + ", ".join(f"{level}={count}" for level, count in self.level_counts.most_common()),
+            "",
+            "=== Errors by type ===",
+        ]
+        for error_type, count in self.error_type_counts.most_common():
+            lines.append(f"{count:>8}  {error_type}")
+
+        lines.append("")
+        header = f"=== Errors per {self.window_seconds}s window"
+        if self.dropped_windows or self.dropped_window_errors:
+            total_windows = len(self.window_counts) + self.dropped_windows
+            header += (f" (last {len(self.window_counts)} of {total_windows} windows;"
+                       f" {self.dropped_window_errors} errors in older windows)")
+        lines.append(header + " ===")
+        for window, count in sorted(self.window_counts.items()):
+            start = datetime.datetime.fromtimestamp(window * self.window_seconds)
+            rate = count / self.window_seconds
+            lines.append(f"{start:%Y-%m-%d %H:%M:%S}  {count:>8}  ({rate:.2f}/s)")
+        if self.unparsed_timestamps:
+            lines.append(f"({self.unparsed_timestamps} errors had unparseable timestamps and are not included)")
+
+        lines.append("")
+        lines.append(f"=== Top {self.top_n} error messages ===")
+        for message, count in self.top_messages():
+            lines.append(f"{count:>8}  {message}")
+
+        return "\n".join(lines)
+
+    def _count_message(self, message: str):
+        """
+        Helper method implementing Space-Saving top-k counting.
+        """
+        if message not in self.message_counts:
+            if len(self.message_counts) < self.capacity:
+                self.message_counts[message] = 0
+                self._count_buckets.setdefault(0, {})[message] = None
+                self._min_count = 0
+            else:
+                # Replace the least frequent entry, inheriting its count as an upper bound.
+                bucket = self._count_buckets[self._min_count]
+                evicted = next(iter(bucket))
+                del bucket[evicted]
+                self.message_counts[message] = self.message_counts.pop(evicted)
+                bucket[message] = None
+        self._increment(message)
+
+    def _increment(self, message: str):
+        """
+        Helper method to move a tracked message up to the next count bucket.
+        """
+        count = self.message_counts[message]
+        bucket = self._count_buckets[count]
+        del bucket[message]
+        if not bucket:
+            del self._count_buckets[count]
+            # Counts only ever step up by one, so the new minimum is count + 1.
+            if count == self._min_count:
+                self._min_count = count + 1
+        self._count_buckets.setdefault(count + 1, {})[message] = None
+        self.message_counts[message] = count + 1
+
+    def _window_for(self, timestamp: str):
+        """
+        Helper method to map a timestamp string to its window index. Accepts
+        ISO 8601 (including a trailing "Z") and numeric epochs in seconds or
+        milliseconds; returns None if the timestamp cannot be parsed.
+        """
+        if timestamp == self._last_timestamp:
+            return self._last_window
+
+        epoch = _parse_timestamp(timestamp)
+        self._last_timestamp = timestamp
+        self._last_window = None if epoch is None else int(epoch) // self.window_seconds
+        return self._last_window
+
+
+def _parse_timestamp(timestamp: str):
+    """
+    Helper converting a timestamp string to seconds since the epoch, or None.
+    """
+    try:
+        # fromisoformat only accepts "Z" from Python 3.11 onwards.
+        if timestamp.endswith(("Z", "z")):
+            timestamp = timestamp[:-1] + "+00:00"
+        return datetime.datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        pass
+    try:
+        epoch = float(timestamp)
+    except ValueError:
+        return None
+    if epoch != epoch or epoch in (float("inf"), float("-inf")):
+        return None
+    # Epochs this large are in milliseconds (1e11 seconds is in the year 5138).
+    return epoch / 1000 if abs(epoch) >= 1e11 else epoch
+
+
+def _consume(f, stats: LogStats, pending: bytes = b"", chunk_size: int = CHUNK_SIZE,
+             max_line_length: int = MAX_LINE_LENGTH):
+    """
+    Helper method to read an open binary file up to EOF in large chunks,
+    feeding every complete line into stats. Lines longer than max_line_length
+    are counted as unparsed and their bytes dropped up to the next newline.
+
+    Returns:
+        tuple: (bytes | None, bool)
+            - bytes is the trailing partial line, to be completed by a later read,
+              or None while still skipping the rest of an overlong line,
+            - bool is whether any new data was read.
+    """
+    read_any = False
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return pending, read_any
+        read_any = True
+
+        if pending is None:
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                continue
+            chunk = chunk[newline + 1:]
+            pending = b""
+
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if len(line) > max_line_length:
+                stats.add_skipped_line()
+            else:
+                stats.add_line(line)
+
+        if len(pending) > max_line_length:
+            stats.add_skipped_line()
+            pending = None
+
+
+def read_records(log_file: str, stats: LogStats, chunk_size: int = CHUNK_SIZE,
+                 max_line_length: int = MAX_LINE_LENGTH) -> LogStats:
+    """
+    Reads a whole log file once and accumulates statistics.
+
+    Args:
+        log_file (str): Path to the log file.
+        stats (LogStats): Statistics to update.
+        chunk_size (int): Number of bytes read per system call.
+        max_line_length (int): Lines longer than this are skipped and counted as unparsed.
+
+    Returns:
+        LogStats: The updated statistics.
+    """
+    with open(log_file, "rb") as f:
+        pending, _ = _consume(f, stats, chunk_size=chunk_size, max_line_length=max_line_length)
+    if pending:
+        stats.add_line(pending)
+    return stats
+
+
+def follow(log_file: str, stats: LogStats, on_update=None, poll_interval: float = 1.0,
+           chunk_size: int = CHUNK_SIZE, stop=None, max_line_length: int = MAX_LINE_LENGTH) -> LogStats:
+    """
+    Reads a log file and keeps tailing it, like `tail -F`, updating the
+    statistics as new lines are appended. Truncation restarts from the
+    beginning of the file; rotation reopens the new file at the same path.
+
+    Args:
+        log_file (str): Path to the log file.
+        stats (LogStats): Statistics to update.
+        on_update (callable): Called with stats after each batch of new lines.
+        poll_interval (float): Seconds to wait when no new data is available.
+        chunk_size (int): Number of bytes read per system call.
+        stop (callable): Returns True when following should end (defaults to never).
+        max_line_length (int): Lines longer than this are skipped and counted as unparsed.
+
+    Returns:
+        LogStats: The updated statistics.
+    """
+    f = open(log_file, "rb")
+    pending = b""
+    try:
+        while stop is None or not stop():
+            pending, read_any = _consume(f, stats, pending, chunk_size, max_line_length)
+            if read_any:
+                if on_update is not None:
+                    on_update(stats)
+                continue
+
+            try:
+                current = os.stat(log_file)
+            except FileNotFoundError:
+                # Between rotation and the new file being created; wait for it.
+                time.sleep(poll_interval)
+                continue
+
+            if current.st_ino != os.fstat(f.fileno()).st_ino:
+                # Rotated: finish the old file, including a last line with no newline.
+                pending, _ = _consume(f, stats, pending, chunk_size, max_line_length)
+                if pending:
+                    stats.add_line(pending)
+                pending = b""
+                f.close()
+                f = open(log_file, "rb")
+            elif current.st_size < f.tell():
+                # Truncated in place: the partial line is gone with the old contents.
+                f.seek(0)
+                pending = b""
+            else:
+                time.sleep(poll_interval)
+    finally:
+        f.close()
+    return stats
+
+
+def _positive_int(value: str) -> int:
+    """
+    Helper argparse type accepting only integers greater than zero.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def main(argv=None):
+    """
+    Command-line entry point for the log analyzer.
+    """
+    parser = argparse.ArgumentParser(description="Summarize errors in the AppLogger log file.")
+    parser.add_argument("log_file", nargs="?", default="application.log", help="Path to the log file.")
+    parser.add_argument("--follow", "-f", action="store_true", help="Keep reading as the file grows.")
+    parser.add_argument("--window", type=_positive_int, default=60, help="Window size in seconds for error rates.")
+    parser.add_argument("--max-windows", type=_positive_int, default=60,
+                        help="Number of most recent windows to keep and show.")
+    parser.add_argument("--top", type=_positive_int, default=10, help="Number of top error messages to show.")
+    args = parser.parse_args(argv)
+
+    stats = LogStats(window_seconds=args.window, max_windows=args.max_windows, top_n=args.top)
+    try:
+        if args.follow:
+            follow(args.log_file, stats, on_update=lambda s: print(s.report() + "\n"))
+        else:
+            read_records(args.log_file, stats)
+    except FileNotFoundError:
+        print(f"Log file not found: {args.log_file}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+
+    print(stats.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -70,17 +70,18 @@ class PromptSelector:
         }
 
 
-    def generate_prompt(self, user_query: str):
+    def select_template(self, user_query: str):
         """
-        Determines template to use based on user_query
-        content, then appends the user's query to the template.
+        Classifies user_query and returns the matching template on its own,
+        without the query appended. Useful when the template is sent once as
+        system instructions and the query is kept separately (e.g., in a session).
 
         Args:
             user_query (str): The input string from the user.
 
         Returns:
             tuple: (str, QueryCategory)
-                - str is the full prompt, 
+                - str is the template for the category,
                 - QueryCategory is the assigned category.
 
         Raises:
@@ -93,7 +94,25 @@ class PromptSelector:
 
         category = self.label_to_category.get(model_label, QueryCategory.UNKNOWN)
 
-        base_template = self.templates[category]
+        return self.templates[category], category
+
+    def generate_prompt(self, user_query: str):
+        """
+        Determines template to use based on user_query
+        content, then appends the user's query to the template.
+
+        Args:
+            user_query (str): The input string from the user.
+
+        Returns:
+            tuple: (str, QueryCategory)
+                - str is the full prompt, 
+                - QueryCategory is the assigned category.
+
+        Raises:
+            ValueError: If the input query is None or empty.
+        """
+        base_template, category = self.select_template(user_query)
         final_prompt = f"{base_template}\nUser Query: {user_query}"
 
         return final_prompt, category
@@ -0,0 +1,280 @@
+"""
+session_store.py
+
+Keeps multi-turn chat history on the server side so follow-up
+questions can be answered in context without the client resending
+the whole transcript.
+
+Includes:
+- SessionStore class which holds the message history per session ID,
+                evicts idle or least-recently-used sessions, and trims
+                history to a per-category token budget before each call.
+"""
+
+from collections import OrderedDict, deque
+import threading
+import time
+
+# Rough characters-per-token ratio; good enough for budgeting without a tokenizer.
+CHARS_PER_TOKEN = 4
+
+# Keyed by QueryCategory value so this module does not need to load the classifier stack.
+DEFAULT_TOKEN_BUDGETS = {
+    "technical": 3000,
+    "troubleshooting": 2500,
+    "general": 1500,
+    "unknown": 1500,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximates the number of tokens in a piece of text.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Estimated token count (at least 1 for non-empty text).
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class _Session:
+    """
+    History for a single session, stored as compact (role, content) tuples.
+    """
+    __slots__ = ("turns", "chars", "last_access")
+
+    def __init__(self, now: float):
+        self.turns = deque()
+        self.chars = 0
+        self.last_access = now
+
+
+class SessionStore:
+    """
+    Thread-safe: every public method holds an internal lock, since even reads
+    reorder the LRU and expire sessions.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 1800.0,
+        max_total_chars: int = 8_000_000,
+        token_budgets: dict = None,
+        clock=time.monotonic,
+    ):
+        """
+        Initializes an empty session store.
+
+        Args:
+            max_sessions (int): Maximum number of live sessions before LRU eviction.
+            ttl_seconds (float): Idle time after which a session expires.
+            max_total_chars (int): Global cap on stored message text across all sessions.
+            token_budgets (dict): Token budget per QueryCategory value (e.g. "technical")
+                for the history sent to the model (defaults to DEFAULT_TOKEN_BUDGETS).
+            clock (callable): Time source, injectable for testing.
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+        if max_total_chars < 1:
+            raise ValueError("max_total_chars must be at least 1.")
+
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_total_chars = max_total_chars
+        self.token_budgets = dict(token_budgets or DEFAULT_TOKEN_BUDGETS)
+        self.clock = clock
+
+        # Ordered oldest -> most recently used, so eviction pops from the front.
+        self._sessions = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+
+        # Nothing beyond the largest budget is ever sent, so no need to keep it.
+        self._max_history_chars = max(self.token_budgets.values()) * CHARS_PER_TOKEN
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    @property
+    def total_chars(self) -> int:
+        """
+        Total characters of message text currently held across all sessions.
+        """
+        with self._lock:
+            return self._total_chars
+
+    def get_history(self, session_id: str) -> list:
+        """
+        Returns the stored history for a session as Chat API messages.
+
+        Args:
+            session_id (str): Identifier of the conversation.
+
+        Returns:
+            list: Message dicts ({"role": ..., "content": ...}), oldest first.
+        """
+        with self._lock:
+            session = self._touch(session_id)
+            if session is None:
+                return []
+            return [{"role": role, "content": content} for role, content in session.turns]
+
+    def build_messages(self, session_id: str, prompt: str, query_category=None, instructions: str = None) -> list:
+        """
+        Builds the message list for the next Chat API call: the instructions
+        as a system message, as much recent history as fits the category's
+        token budget, and the new prompt.
+
+        Only user queries and replies are stored, so the instructions are sent
+        once per call rather than repeated in every historical turn.
+
+        The oldest user/assistant pairs are dropped first, so the payload per
+        turn stays bounded no matter how long the conversation runs.
+
+        Args:
+            session_id (str): Identifier of the conversation.
+            prompt (str): The new user message.
+            query_category (QueryCategory | str): Category (or its value) used to pick
+                the token budget; unrecognized categories use the "unknown" budget.
+            instructions (str): Optional system instructions (e.g., the category template).
+
+        Returns:
+            list: Message dicts ready to pass to client.chat.
+        """
+        category = getattr(query_category, "value", query_category)
+        budget = self.token_budgets.get(category, self.token_budgets.get("unknown", 0))
+        remaining = budget - estimate_tokens(prompt) - estimate_tokens(instructions)
+
+        with self._lock:
+            session = self._touch(session_id)
+            turns = list(session.turns) if session is not None else []
+
+        # Walk back one exchange at a time so we never send an orphaned reply.
+        i = len(turns)
+        while i > 0 and remaining > 0:
+            start = i - 2 if i >= 2 and turns[i - 2][0] == "user" else i - 1
+            cost = sum(estimate_tokens(content) for _, content in turns[start:i])
+            if cost > remaining:
+                break
+            remaining -= cost
+            i = start
+        kept = turns[i:]
+
+        messages = [{"role": "system", "content": instructions}] if instructions else []
+        messages.extend({"role": role, "content": content} for role, content in kept)
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def record_turn(self, session_id: str, prompt: str, response: str):
+        """
+        Appends a completed user/assistant exchange to the session history,
+        then enforces the per-session and global memory limits. An exchange
+        too large to ever fit the history budget is not stored.
+
+        Args:
+            session_id (str): Identifier of the conversation.
+            prompt (str): The user message that was sent.
+            response (str): The assistant reply that was received.
+        """
+        # A single session never holds more than this, so the global cap can
+        # always be met by evicting other sessions, never the current one.
+        limit = min(self._max_history_chars, self.max_total_chars)
+
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+
+            # An exchange larger than the limit could never be sent back, so
+            # storing it would only evict other sessions' context.
+            if len(prompt) + len(response) > limit:
+                self._touch(session_id)
+                return
+
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _Session(now)
+                self._sessions[session_id] = session
+            else:
+                self._sessions.move_to_end(session_id)
+                session.last_access = now
+
+            for role, content in (("user", prompt), ("assistant", response)):
+                session.turns.append((role, content))
+                session.chars += len(content)
+                self._total_chars += len(content)
+
+            while session.chars > limit:
+                self._drop_oldest(session)
+
+            while len(self._sessions) > self.max_sessions:
+                self._evict_lru()
+            while self._total_chars > self.max_total_chars:
+                self._evict_lru()
+
+    def clear(self, session_id: str):
+        """
+        Removes a session and its history, if present.
+
+        Args:
+            session_id (str): Identifier of the conversation.
+        """
+        with self._lock:
+            self._remove(session_id)
+
+    def _touch(self, session_id: str):
+        """
+        Helper method to fetch a live session and mark it as recently used;
+        the caller must hold the lock.
+        """
+        now = self.clock()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            session.last_access = now
+        return session
+
+    def _expire(self, now: float):
+        """
+        Helper method to drop sessions idle for longer than the TTL.
+        """
+        # Access order matches idle order, so only the front needs checking.
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._remove(session_id)
+
+    def _remove(self, session_id: str):
+        """
+        Helper method to remove a session; the caller must hold the lock.
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._total_chars -= session.chars
+
+    def _evict_lru(self):
+        """
+        Helper method to remove the least recently used session.
+        """
+        _, session = self._sessions.popitem(last=False)
+        self._total_chars -= session.chars
+
+    def _drop_oldest(self, session: _Session):
+        """
+        Helper method to remove the oldest exchange from a session.
+        """
+        while session.turns:
+            _, content = session.turns.popleft()
+            session.chars -= len(content)
+            self._total_chars -= len(content)
+            # Stop once the history starts on a user message again.
+            if not session.turns or session.turns[0][0] == "user":
+                break
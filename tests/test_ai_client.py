@@ -67,5 +67,49 @@ class TestAIClient(unittest.TestCase):
         self.assertEqual(response, "Recovered content")
         self.assertEqual(mock_instance.chat.call_count, 2)
 
+    @patch("ai_client.cohere.ClientV2")
+    def test_session_history_sent_on_follow_up(self, mock_client_class):
+        """
+        With a session_id, the previous exchange is sent along with the follow-up prompt.
+        """
+        mock_instance = mock_client_class.return_value
+        mock_instance.chat.side_effect = [
+            MagicMock(message=MagicMock(content="First answer")),
+            MagicMock(message=MagicMock(content="Second answer")),
+        ]
+
+        ai_client = AIClient(api_key="fake_key")
+        ai_client.get_ai_response("First question", session_id="abc", instructions="Template")
+        ai_client.get_ai_response("Follow-up question", session_id="abc", instructions="Template")
+
+        # The template is sent once as a system message, not stored in history
+        sent = mock_instance.chat.call_args.kwargs["messages"]
+        self.assertEqual(
+            [(m["role"], m["content"]) for m in sent],
+            [
+                ("system", "Template"),
+                ("user", "First question"),
+                ("assistant", "First answer"),
+                ("user", "Follow-up question"),
+            ],
+        )
+
+    @patch("ai_client.cohere.ClientV2")
+    def test_session_recording_failure_does_not_retry(self, mock_client_class):
+        """
+        A failure while recording the session must not repeat the Cohere call.
+        """
+        mock_instance = mock_client_class.return_value
+        mock_instance.chat.return_value = MagicMock(message=MagicMock(content="Answer"))
+
+        ai_client = AIClient(api_key="fake_key", max_retries=3, retry_delay=0)
+        ai_client.session_store = MagicMock()
+        ai_client.session_store.build_messages.return_value = [{"role": "user", "content": "Question"}]
+        ai_client.session_store.record_turn.side_effect = RuntimeError("bookkeeping bug")
+
+        with self.assertRaises(RuntimeError):
+            ai_client.get_ai_response("Question", session_id="abc")
+        mock_instance.chat.assert_called_once()
+
 if __name__ == "__main__":
     unittest.main()
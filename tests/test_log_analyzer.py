@@ -0,0 +1,201 @@
+import os
+import tempfile
+import io
+import unittest
+from unittest.mock import patch
+from log_analyzer import LogStats, follow, main, parse_line, read_records
+
+SAMPLE_LOG = (
+    b"[2025-01-01 12:00:05] INFO: SystemStart - booted\n"
+    b"[2025-01-01 12:00:10] ERROR: AIClientError - Cohere Chat API failed\n"
+    b"[2025-01-01 12:00:20] ERROR: AIClientError - Cohere Chat API failed\n"
+    b"[2025-01-01 12:01:30] ERROR: PromptSelectorError - User query is empty or None.\n"
+    b"Traceback continuation line\n"
+    b'{"timestamp": "2025-01-01T12:01:40", "level": "error", "type": "AIClientError", "message": "timeout"}\n'
+)
+
+class TestParseLine(unittest.TestCase):
+    def test_text_format(self):
+        record = parse_line(b"[2025-01-01 12:00:10] ERROR: AIClientError - Failed - twice")
+        self.assertEqual(record.level, "ERROR")
+        self.assertEqual(record.type, "AIClientError")
+        self.assertEqual(record.message, "Failed - twice")
+
+    def test_json_format(self):
+        record = parse_line(b'{"timestamp": "2025-01-01T12:00:10", "level": "error", "type": "X", "message": "m"}')
+        self.assertEqual(record.level, "ERROR")
+        self.assertEqual(record.type, "X")
+
+    def test_unrecognized_line(self):
+        self.assertIsNone(parse_line(b"not a log line"))
+        self.assertIsNone(parse_line(b"{broken json"))
+
+class TestLogStats(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            f.write(SAMPLE_LOG)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_single_pass_summary(self):
+        """
+        Small chunks force lines to be split across reads.
+        """
+        stats = read_records(self.path, LogStats(window_seconds=60), chunk_size=7)
+
+        self.assertEqual(stats.total_lines, 6)
+        self.assertEqual(stats.unparsed_lines, 1)
+        self.assertEqual(stats.level_counts["ERROR"], 4)
+        self.assertEqual(stats.error_type_counts["AIClientError"], 3)
+        self.assertEqual(sorted(stats.window_counts.values()), [2, 2])
+        self.assertEqual(stats.top_messages()[0], ("AIClientError - Cohere Chat API failed", 2))
+        self.assertIn("PromptSelectorError", stats.report())
+
+    def test_structured_timestamp_formats(self):
+        stats = LogStats(window_seconds=60)
+        for timestamp in ('"2025-01-01T12:00:00Z"', '"1735732800"', "1735732810", "1735732815.5",
+                          "1735732820000", '"not a time"'):
+            stats.add_line(f'{{"timestamp": {timestamp}, "level": "error", "type": "E", "message": "m"}}'.encode())
+
+        self.assertEqual(stats.error_type_counts["E"], 6)
+        self.assertEqual(stats.window_counts, {1735732800 // 60: 5})
+        self.assertEqual(stats.unparsed_timestamps, 1)
+        self.assertIn("1 errors had unparseable timestamps", stats.report())
+
+    def test_overlong_lines_are_skipped(self):
+        """
+        A long run without a newline is dropped instead of buffered in full.
+        """
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 1000 + b"\n")
+            f.write(b"[2025-01-01 12:00:10] ERROR: Kept - short line\n")
+            f.write(b"y" * 1000)
+
+        stats = read_records(self.path, LogStats(), chunk_size=64, max_line_length=100)
+
+        self.assertEqual(stats.total_lines, 3)
+        self.assertEqual(stats.unparsed_lines, 2)
+        self.assertEqual(stats.error_type_counts["Kept"], 1)
+
+    def test_top_messages_memory_is_bounded(self):
+        stats = LogStats(top_n=2, capacity=3)
+        for i in range(100):
+            stats.add_line(f"[2025-01-01 12:00:00] ERROR: E - unique {i}".encode())
+        for _ in range(50):
+            stats.add_line(b"[2025-01-01 12:00:00] ERROR: E - frequent")
+
+        self.assertEqual(len(stats.message_counts), 3)
+        self.assertEqual(stats.top_messages()[0][0], "E - frequent")
+
+    def test_top_messages_with_many_distinct_messages(self):
+        """
+        Past capacity, frequent messages are still found and counts never
+        undercount (Space-Saving guarantees).
+        """
+        stats = LogStats(top_n=3, capacity=50)
+        true_counts = {}
+        for i in range(20000):
+            if i % 10 == 0:
+                message = "hot"
+            elif i % 25 == 0:
+                message = "warm"
+            else:
+                message = f"unique {i}"
+            true_counts[message] = true_counts.get(message, 0) + 1
+            stats.add_line(f"[2025-01-01 12:00:00] ERROR: E - {message}".encode())
+
+        self.assertEqual(len(stats.message_counts), 50)
+        top = dict(stats.top_messages())
+        self.assertEqual(list(top)[:2], ["E - hot", "E - warm"])
+        for message, count in stats.message_counts.items():
+            self.assertGreaterEqual(count, true_counts[message[len("E - "):]])
+
+        # Buckets stay consistent with the counters
+        bucketed = {m: c for c, bucket in stats._count_buckets.items() for m in bucket}
+        self.assertEqual(bucketed, stats.message_counts)
+        self.assertEqual(stats._min_count, min(stats.message_counts.values()))
+
+    def test_late_lines_do_not_evict_newer_windows(self):
+        stats = LogStats(window_seconds=60, max_windows=3)
+        for minute in ("10", "11", "12", "09", "11"):
+            stats.add_line(f"[2025-01-01 12:{minute}:00] ERROR: E - m".encode())
+
+        kept = sorted(stats.window_counts)
+        self.assertEqual(len(kept), 3)
+        self.assertEqual(kept[-1] - kept[0], 2)  # 12:10, 12:11 and 12:12
+        self.assertEqual(stats.window_counts[kept[1]], 2)
+
+        # A newer window evicts the oldest by time
+        stats.add_line(b"[2025-01-01 12:13:00] ERROR: E - m")
+        self.assertEqual(min(stats.window_counts), kept[1])
+
+        # The report says that older windows were dropped
+        self.assertEqual(stats.dropped_windows, 1)
+        self.assertEqual(stats.dropped_window_errors, 2)  # the late 12:09 line and 12:10
+        self.assertIn("last 3 of 4 windows; 2 errors in older windows", stats.report())
+
+    def test_follow_picks_up_appended_lines(self):
+        stats = LogStats()
+        polls = []
+
+        def stop():
+            polls.append(None)
+            if len(polls) == 2:
+                with open(self.path, "ab") as f:
+                    f.write(b"[2025-01-01 12:02:00] ERROR: LateError - appended\n")
+            return len(polls) > 4
+
+        follow(self.path, stats, poll_interval=0, stop=stop)
+
+        self.assertEqual(stats.error_type_counts["LateError"], 1)
+        self.assertEqual(stats.total_lines, 7)
+
+    def test_follow_keeps_last_line_across_rotation(self):
+        stats = LogStats()
+        polls = []
+
+        def stop():
+            polls.append(None)
+            if len(polls) == 1:
+                with open(self.path, "ab") as f:
+                    f.write(b"[2025-01-01 12:02:00] ERROR: Unterminated - no newline")
+            elif len(polls) == 3:
+                os.rename(self.path, self.path + ".1")
+                with open(self.path, "wb") as f:
+                    f.write(b"[2025-01-01 12:03:00] ERROR: NewFile - after rotation\n")
+            return len(polls) > 6
+
+        try:
+            follow(self.path, stats, poll_interval=0, stop=stop)
+        finally:
+            os.remove(self.path + ".1")
+
+        self.assertEqual(stats.error_type_counts["Unterminated"], 1)
+        self.assertEqual(stats.error_type_counts["NewFile"], 1)
+
+class TestCommandLine(unittest.TestCase):
+    @patch("sys.stderr", new_callable=io.StringIO)
+    def test_non_positive_window_rejected(self, mock_stderr):
+        for value in ("0", "-5"):
+            with self.assertRaises(SystemExit) as ctx:
+                main(["application.log", "--window", value])
+            self.assertEqual(ctx.exception.code, 2)
+        self.assertIn("must be a positive integer", mock_stderr.getvalue())
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_max_windows_option(self, mock_stdout):
+        fd, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            for minute in range(5):
+                f.write(f"[2025-01-01 12:0{minute}:00] ERROR: E - m\n".encode())
+        try:
+            self.assertEqual(main([path, "--max-windows", "2"]), 0)
+        finally:
+            os.remove(path)
+
+        self.assertIn("last 2 of 5 windows; 3 errors in older windows", mock_stdout.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
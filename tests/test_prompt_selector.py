@@ -36,6 +36,22 @@ class TestPromptSelector(unittest.TestCase):
         self.assertEqual(category, QueryCategory.TROUBLESHOOTING)
         self.assertIn("technical support specialist", prompt.lower())
 
+    @patch("prompt_selector.load")
+    def test_select_template_excludes_query(self, mock_load):
+        """
+        select_template returns the bare template so it can be sent separately from the query.
+        """
+        mock_pipeline = MagicMock()
+        mock_pipeline.predict.return_value = ["general"]
+        mock_load.return_value = mock_pipeline
+
+        selector = PromptSelector()
+        template, category = selector.select_template("Who wrote Hamlet?")
+
+        self.assertEqual(category, QueryCategory.GENERAL)
+        self.assertEqual(template, selector.templates[QueryCategory.GENERAL])
+        self.assertNotIn("Hamlet", template)
+
     @patch("prompt_selector.load")
     def test_empty_query_raises_valueerror(self, mock_load):
         # Ensure no classification attempt if the query is empty
@@ -0,0 +1,135 @@
+import threading
+import unittest
+from prompt_selector import QueryCategory
+from session_store import SessionStore, estimate_tokens
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = SessionStore(
+            max_sessions=2,
+            ttl_seconds=60,
+            token_budgets={
+                "technical": 50,
+                "unknown": 20,
+            },
+            clock=self.clock,
+        )
+
+    def test_new_session_sends_only_prompt(self):
+        messages = self.store.build_messages("s1", "Hello", QueryCategory.TECHNICAL)
+        self.assertEqual(messages, [{"role": "user", "content": "Hello"}])
+
+    def test_history_is_prepended(self):
+        self.store.record_turn("s1", "What is a list?", "An ordered collection.")
+        messages = self.store.build_messages("s1", "And a tuple?", QueryCategory.TECHNICAL)
+
+        self.assertEqual([m["role"] for m in messages], ["user", "assistant", "user"])
+        self.assertEqual(messages[-1]["content"], "And a tuple?")
+
+    def test_history_trimmed_to_category_budget(self):
+        """
+        Payload size stays bounded however long the conversation gets.
+        """
+        for i in range(20):
+            self.store.record_turn("s1", f"question {i} " * 4, f"answer {i} " * 4)
+
+        messages = self.store.build_messages("s1", "next", QueryCategory.TECHNICAL)
+        total = sum(estimate_tokens(m["content"]) for m in messages)
+
+        self.assertLessEqual(total, 50)
+        self.assertEqual(messages[0]["role"], "user")
+        self.assertIn("question 19", messages[-3]["content"])
+
+        # Smaller budget for the fallback category keeps even less history
+        fewer = self.store.build_messages("s1", "next", QueryCategory.GENERAL)
+        self.assertLess(len(fewer), len(messages))
+
+        # Plain category values work the same as the enum
+        self.assertEqual(self.store.build_messages("s1", "next", "technical"), messages)
+
+    def test_lru_eviction(self):
+        self.store.record_turn("s1", "a", "b")
+        self.store.record_turn("s2", "c", "d")
+        self.store.get_history("s1")  # s1 becomes most recently used
+        self.store.record_turn("s3", "e", "f")
+
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get_history("s2"), [])
+        self.assertEqual(len(self.store.get_history("s1")), 2)
+
+    def test_ttl_expiry(self):
+        self.store.record_turn("s1", "a", "b")
+        self.clock.now = 61
+
+        self.assertEqual(self.store.get_history("s1"), [])
+        self.assertEqual(self.store.total_chars, 0)
+
+    def test_global_memory_cap(self):
+        store = SessionStore(max_sessions=10, max_total_chars=20, clock=self.clock)
+        store.record_turn("s1", "x" * 5, "y" * 5)
+        store.record_turn("s2", "x" * 5, "y" * 5)
+        store.record_turn("s3", "x" * 5, "y" * 5)
+
+        self.assertLessEqual(store.total_chars, 20)
+        self.assertEqual(store.get_history("s1"), [])
+
+    def test_oversized_turn_does_not_evict_other_sessions(self):
+        store = SessionStore(max_sessions=100, max_total_chars=100000, clock=self.clock)
+        for i in range(50):
+            store.record_turn(f"s{i}", "q" * 100, "a" * 100)
+        store.record_turn("big", "old question", "old answer")
+
+        store.record_turn("big", "x" * 200000, "ok")
+
+        self.assertEqual(len(store), 51)
+        self.assertLessEqual(store.total_chars, 100000)
+        self.assertEqual(len(store.get_history("big")), 2)
+        self.assertEqual(len(store.get_history("s0")), 2)
+
+    def test_global_cap_is_strict(self):
+        store = SessionStore(max_sessions=10, max_total_chars=25, clock=self.clock)
+        store.record_turn("s1", "x" * 5, "y" * 5)
+        store.record_turn("s2", "x" * 5, "y" * 5)
+        store.record_turn("s2", "x" * 5, "y" * 5)
+
+        self.assertLessEqual(store.total_chars, 25)
+        self.assertEqual(store.get_history("s1"), [])
+        self.assertEqual(len(store.get_history("s2")), 4)
+
+    def test_concurrent_access(self):
+        store = SessionStore(max_sessions=5, ttl_seconds=3600)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(300):
+                    session_id = f"s{(n + i) % 8}"
+                    store.build_messages(session_id, "q", QueryCategory.GENERAL)
+                    store.record_turn(session_id, "q", "a")
+                    store.get_history(session_id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(store), 5)
+        self.assertEqual(
+            store.total_chars,
+            sum(len(m["content"]) for i in range(8) for m in store.get_history(f"s{i}")),
+        )
+
+if __name__ == "__main__":
+    unittest.main()